@@ -7,9 +7,16 @@ from __future__ import annotations
 import re
 from typing import Dict
 
+# Codepoint ranges treated as emoji (Misc Symbols/Dingbats, Pictographs).
+_EMOJI_RANGES = ((0x2600, 0x27BF), (0x1F300, 0x1FAFF))
+
+_EMOJI_RE = re.compile(
+    "[" + "".join(f"{chr(lo)}-{chr(hi)}" for lo, hi in _EMOJI_RANGES) + "]"
+)
+
 
 def contains_emoji(text: str) -> bool:
-    return bool(re.search(r"[\u2600-\u27BF\U0001F300-\U0001FAFF]", text))
+    return _EMOJI_RE.search(text) is not None
 
 
 def build_adcp_payload(product: str, audience: str, caption: str, meta: Dict[str, str]) -> Dict:
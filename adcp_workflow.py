@@ -5,11 +5,19 @@ CLI entrypoint for the Creator/Critic loop, orchestrated with LangGraph.
 from __future__ import annotations
 
 import argparse
+import codecs
+import functools
 import json
+import sys
 import warnings
 from typing import List, Dict, Any
 
-from pydantic import BaseModel, Field
+import msgspec
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
 
 warnings.filterwarnings("ignore", message=".*Pydantic V1.*", category=UserWarning)
 
@@ -38,8 +46,35 @@ def _attempts_as_adcp(attempts: List[Attempt]) -> Dict[str, Any]:
         "attempts": entries,
     }
 
-# pydantic models used to validate and describe the JSON output 
-class AttemptEntryModel(BaseModel):
+_JSON_ENCODER = json.JSONEncoder(indent=2)
+
+
+def _stdout_is_utf8() -> bool:
+    encoding = getattr(sys.stdout, "encoding", None)
+    if not encoding:
+        return False
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+def _write_json(obj: Dict[str, Any]) -> None:
+    """Write obj to stdout as indented JSON, using orjson when stdout is UTF-8."""
+    buf = getattr(sys.stdout, "buffer", None)
+    if orjson is not None and buf is not None and _stdout_is_utf8():
+        # flush pending print() text so the raw bytes land after it
+        sys.stdout.flush()
+        buf.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2) + b"\n")
+        return
+    # stream encoder chunks instead of building the whole document as one str;
+    # output stays ASCII-escaped so it is safe for any stdout encoding
+    sys.stdout.writelines(_JSON_ENCODER.iterencode(obj))
+    sys.stdout.write("\n")
+
+
+# msgspec structs used to validate and describe the JSON output 
+class AttemptEntryModel(msgspec.Struct):
     sequence: int
     type: str
     content: str
@@ -47,38 +82,40 @@ class AttemptEntryModel(BaseModel):
     feedback: str
 
 # after generating attempts and final caption, build the attempt log and final payload dicts 
-class AttemptLogModel(BaseModel):
+class AttemptLogModel(msgspec.Struct):
     adcp_version: str
     task: str
     attempts: List[AttemptEntryModel]
 
 
-class CreativeAssetModel(BaseModel):
+class CreativeAssetModel(msgspec.Struct):
     type: str
     content: str
 
 
-class PayloadModel(BaseModel):
+class PayloadModel(msgspec.Struct):
     target_audience: str
     creative_assets: List[CreativeAssetModel]
     product: str
 
 
-class MetadataModel(BaseModel):
+class MetadataModel(msgspec.Struct):
     length: int
     word_count: int
     sentiment: str
     brand_safety_check: str
 
 
-class FinalAdcpModel(BaseModel):
+class FinalAdcpModel(msgspec.Struct):
     adcp_version: str
     task: str
     payload: PayloadModel
     metadata: MetadataModel
 
 
-def main() -> None:
+@functools.cache
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; parse_args does not mutate it."""
     parser = argparse.ArgumentParser(
         description="Creator & Critic loop producing AdCP-style JSON output (LangGraph).",
     )
@@ -134,7 +171,11 @@ def main() -> None:
         default=None,
         help="Optional OpenAI-compatible base URL (for proxies/self-hosted).",
     )
-    args = parser.parse_args()
+    return parser
+
+
+def main() -> None:
+    args = _get_parser().parse_args()
 
     final_state = run_workflow(
         args.product,
@@ -168,10 +209,10 @@ def main() -> None:
     metadata = final_state.get("metadata", {})
 
     attempts_log = _attempts_as_adcp(attempts)
-    AttemptLogModel.model_validate(attempts_log)
+    msgspec.convert(attempts_log, AttemptLogModel)
 
     print("\nAttempt Log (AdCP-style):")
-    print(json.dumps(attempts_log, indent=2))
+    _write_json(attempts_log)
 
     final_payload = build_adcp_payload(
         product=args.product,
@@ -180,10 +221,10 @@ def main() -> None:
         meta=metadata,
     )
 
-    FinalAdcpModel.model_validate(final_payload)
+    msgspec.convert(final_payload, FinalAdcpModel)
 
     print("\nFinal AdCP JSON:")
-    print(json.dumps(final_payload, indent=2))
+    _write_json(final_payload)
 
 
 if __name__ == "__main__":
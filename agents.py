@@ -7,21 +7,43 @@ from __future__ import annotations
 import random
 import re
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import Callable, Dict, Iterable, List, Optional
 
 from adcp_payload import contains_emoji
 
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to a compiled regex alternation
+    ahocorasick = None
+
+
+def _blocklist_matcher(terms: Iterable[str]) -> Callable[[str], bool]:
+    """Return a predicate telling whether lowercased text contains any blocked term.
 
-@dataclass
+    Uses a single-pass Aho-Corasick automaton when pyahocorasick is installed,
+    so the scan cost does not grow with the size of the blocklist.
+    """
+    terms = sorted({term.lower() for term in terms if term})
+    if not terms:
+        return lambda text: False
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    pattern = re.compile("|".join(map(re.escape, terms)))
+    return lambda text: pattern.search(text) is not None
+
+
+@dataclass(slots=True)
 class Evaluation:
     approved: bool
     feedback: str
     metadata: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Attempt:
     caption: str
     evaluation: Evaluation
@@ -40,9 +62,13 @@ class Creator:
             "{audience}, grab {product} and win! 🏆",
             "Stay sharp with {product}, {audience}! ✨",
         ]
+        # product/audience are fixed per instance, so format every template up front
+        self._captions = [
+            template.format(product=product, audience=audience) for template in self.templates
+        ]
 
     def _pick_template(self) -> str:
-        return random.choice(self.templates)
+        return random.choice(self._captions)
 
     def _apply_feedback(self, caption: str, feedback: str) -> str:
         """Adjust caption heuristically using feedback keywords."""
@@ -59,14 +85,12 @@ class Creator:
             caption = caption.strip()
             caption = f"{self.product} - {caption}"
 
-        caption = re.sub(r"\s+", " ", caption).strip()
+        caption = " ".join(caption.split())
         return caption
 
     def propose(self, feedback: Optional[str] = None) -> str:
         if feedback is None or not self.attempts:
-            caption = self._pick_template().format(
-                product=self.product, audience=self.audience
-            )
+            caption = self._pick_template()
         else:
             last_caption = self.attempts[-1].caption
             caption = self._apply_feedback(last_caption, feedback)
@@ -76,13 +100,29 @@ class Creator:
 class Critic:
     """Evaluates captions against strict acceptance rules."""
 
-    def __init__(self, product: str, max_words: int = 15) -> None:
+    def __init__(
+        self, product: str, max_words: int = 15, blocklist: Optional[Iterable[str]] = None
+    ) -> None:
         self.product = product
         self.max_words = max_words
-        self.blocklist = {"kill", "violence", "hate"}
+        self.blocklist = blocklist if blocklist is not None else {"kill", "violence", "hate"}
+        self._product_lower = product.lower()
+
+    @property
+    def blocklist(self) -> frozenset:
+        return self._blocklist
+
+    @blocklist.setter
+    def blocklist(self, terms: Iterable[str]) -> None:
+        # Frozen so the terms cannot drift from the matcher built from them.
+        self._blocklist = frozenset(terms)
+        self._is_blocked = _blocklist_matcher(self._blocklist)
 
     def evaluate(self, caption: str) -> Evaluation:
         rules_failed: List[str] = []
+        # Lowercase as str, not bytes: bytes.lower() only folds ASCII, and the
+        # blocklist matcher (Aho-Corasick or re) scans str.
+        lowered = caption.lower()
 
         if not contains_emoji(caption):
             rules_failed.append("Must contain an emoji.")
@@ -91,10 +131,10 @@ class Critic:
         if word_count > self.max_words:
             rules_failed.append(f"Too long ({word_count} words). Keep under {self.max_words}.")
 
-        if self.product.lower() not in caption.lower():
+        if self._product_lower not in lowered:
             rules_failed.append("Please mention the product by name.")
 
-        if any(term in caption.lower() for term in self.blocklist):
+        if self._is_blocked(lowered):
             rules_failed.append("Contains blocked terms; rewrite for brand safety.")
 
         if rules_failed:
@@ -112,6 +152,11 @@ class Critic:
         }
         return Evaluation(approved=True, feedback="Approved", metadata=metadata)
 
+    def evaluate_batch(self, captions: List[str]) -> List[Evaluation]:
+        """Evaluate many captions in one call (e.g. offline scoring of candidates)."""
+        evaluate = self.evaluate
+        return [evaluate(caption) for caption in captions]
+
 
 class LLMCreator:
     """Creator backed by an injected LangChain chat model (Ollama by default).
@@ -139,20 +184,27 @@ class LLMCreator:
 
             self.llm = ChatOllama(model=model, temperature=temperature, base_url=base_url)
 
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        self._human_message = HumanMessage
+
+        # The system prompt is constant for the agent's lifetime; build it once.
+        self._system = SystemMessage(
+            content=(
+                "You are an ad copywriter. Generate ONE short caption that:\n"
+                "- Mentions the product name exactly as given.\n"
+                "- Is 15 words or fewer.\n"
+                "- Includes at least one emoji.\n"
+                "- Avoids blocked terms: kill, violence, hate.\n"
+                "- Tone: energetic, concise."
+            )
+        )
+
     def propose(self, feedback: Optional[str] = None) -> str:
         feedback_text = feedback or "No prior feedback; follow the rules."
         messages = [
-            SystemMessage(
-                content=(
-                    "You are an ad copywriter. Generate ONE short caption that:\n"
-                    "- Mentions the product name exactly as given.\n"
-                    "- Is 15 words or fewer.\n"
-                    "- Includes at least one emoji.\n"
-                    "- Avoids blocked terms: kill, violence, hate.\n"
-                    "- Tone: energetic, concise."
-                )
-            ),
-            HumanMessage(
+            self._system,
+            self._human_message(
                 content=(
                     f"Product: {self.product}\n"
                     f"Audience: {self.audience}\n"
@@ -165,7 +217,7 @@ class LLMCreator:
         caption = str(getattr(result, "content", result)).strip()
         # Strip wrapping quotes if the model returns a quoted string.
         caption = caption.strip('"').strip("'")
-        caption = re.sub(r"\s+", " ", caption)
+        caption = " ".join(caption.split())
         return caption
 
 
@@ -174,7 +226,8 @@ class LLMCritic:
 
     Prompt intent: strict check to ensure the caption mentions the
     product, is <=15 words, includes an emoji, and avoids blocked terms. Responds with
-    either APPROVED or REJECTED plus concise violated-rule feedback.
+    either APPROVED or REJECTED plus concise violated-rule feedback. Captions that
+    fail the deterministic Critic rules are rejected without calling the model.
     """
 
     def __init__(
@@ -185,11 +238,12 @@ class LLMCritic:
         temperature: float = 0.0,
         base_url: str = "http://localhost:11434",
         llm=None,
-        blocklist: Optional[set] = None,
+        blocklist: Optional[Iterable[str]] = None,
     ) -> None:
         self.product = product
         self.max_words = max_words
-        self.blocklist = blocklist or {"kill", "violence", "hate"}
+        # Deterministic rules, checked before (and instead of) the LLM when they fail.
+        self._rules = Critic(product, max_words=max_words, blocklist=blocklist)
         if llm is not None:
             self.llm = llm
         else:
@@ -197,22 +251,46 @@ class LLMCritic:
 
             self.llm = ChatOllama(model=model, temperature=temperature, base_url=base_url)
 
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        self._human_message = HumanMessage
+
+        # Depends only on product/max_words, which are fixed per instance.
+        self._system = SystemMessage(
+            content=(
+                "You are a strict ad quality and safety checker.\n"
+                f"- Caption must mention the product name: {self.product}.\n"
+                f"- Caption must be {self.max_words} words or fewer.\n"
+                "- Caption must include at least one emoji.\n"
+                "- Avoid blocked terms: kill, violence, hate.\n"
+                "Respond with either:\n"
+                "APPROVED\n"
+                "or\n"
+                "REJECTED: <concise feedback listing violated rules>"
+            )
+        )
+
+    @property
+    def blocklist(self) -> frozenset:
+        return self._rules.blocklist
+
+    @blocklist.setter
+    def blocklist(self, terms: Iterable[str]) -> None:
+        self._rules.blocklist = terms
+
     def evaluate(self, caption: str) -> Evaluation:
+        # Do the simple checks first; only call the LLM when the hard rules all pass.
+        precheck = self._rules.evaluate(caption)
+        if not precheck.approved:
+            return Evaluation(
+                approved=False,
+                feedback=precheck.feedback,
+                metadata=self._metadata(caption, "rejected", "failed"),
+            )
+
         messages = [
-            SystemMessage(
-                content=(
-                    "You are a strict ad quality and safety checker.\n"
-                    f"- Caption must mention the product name: {self.product}.\n"
-                    f"- Caption must be {self.max_words} words or fewer.\n"
-                    "- Caption must include at least one emoji.\n"
-                    "- Avoid blocked terms: kill, violence, hate.\n"
-                    "Respond with either:\n"
-                    "APPROVED\n"
-                    "or\n"
-                    "REJECTED: <concise feedback listing violated rules>"
-                )
-            ),
-            HumanMessage(
+            self._system,
+            self._human_message(
                 content=(
                     f"Product: {self.product}\n"
                     f"Caption: {caption}\n"
@@ -238,38 +316,17 @@ class LLMCritic:
             status = "rejected"
             brand_safety = "failed"
 
-        # Deterministic post-checks 
-        hard_failures = self._hard_rules(caption)
-        if hard_failures:
-            approved = False
-            status = "rejected"
-            brand_safety = "failed"
-            if feedback == "Approved":
-                feedback = " ".join(hard_failures)
-            else:
-                feedback = (feedback + " " + " ".join(hard_failures)).strip()
+        return Evaluation(
+            approved=approved,
+            feedback=feedback,
+            metadata=self._metadata(caption, status, brand_safety),
+        )
 
-        word_count = len(caption.split())
-        metadata = {
+    @staticmethod
+    def _metadata(caption: str, status: str, brand_safety: str) -> Dict[str, str]:
+        return {
             "status": status,
             "length": str(len(caption)),
-            "word_count": str(word_count),
+            "word_count": str(len(caption.split())),
             "brand_safety_check": brand_safety,
         }
-        return Evaluation(approved=approved, feedback=feedback, metadata=metadata)
-
-    def _hard_rules(self, caption: str) -> List[str]:
-        failures: List[str] = []
-        word_count = len(caption.split())
-
-        if not contains_emoji(caption):
-            failures.append("Must contain an emoji.")
-        if word_count > self.max_words:
-            failures.append(f"Too long ({word_count} words). Keep under {self.max_words}.")
-        if self.product.lower() not in caption.lower():
-            failures.append("Please mention the product by name.")
-        if any(term in caption.lower() for term in self.blocklist):
-            failures.append("Contains blocked terms; rewrite for brand safety.")
-
-        return failures
-
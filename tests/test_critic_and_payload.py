@@ -1,7 +1,14 @@
+import io
+import json
+from contextlib import redirect_stdout
+
 import pytest
 
-from agents import Critic, Evaluation
-from adcp_payload import build_adcp_payload
+import adcp_workflow
+import agents
+
+from agents import Critic, Evaluation, LLMCritic
+from adcp_payload import build_adcp_payload, contains_emoji
 
 
 def test_critic_approves_valid_caption():
@@ -18,6 +25,100 @@ def test_critic_rejects_missing_emoji():
     assert "emoji" in evaluation.feedback.lower()
 
 
+def test_critic_rejects_blocked_term_case_insensitively():
+    critic = Critic(product="Prod", max_words=10)
+    evaluation: Evaluation = critic.evaluate("Prod will KILL it ⚡")
+    assert evaluation.approved is False
+    assert "blocked terms" in evaluation.feedback
+
+
+@pytest.fixture(params=["ahocorasick", "re"])
+def blocklist_backend(request, monkeypatch):
+    """Run the test against both _blocklist_matcher backends."""
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(agents, "ahocorasick", None)
+    return request.param
+
+
+def test_critic_accepts_custom_blocklist(blocklist_backend):
+    critic = Critic(product="Prod", max_words=10, blocklist={"Cheap", "scam"})
+    assert critic.evaluate("Prod is cheap ⚡").approved is False
+    assert critic.evaluate("Prod rocks ⚡").approved is True
+
+
+def test_critic_blocklist_reassignment_rebuilds_matcher(blocklist_backend):
+    critic = Critic(product="Prod", max_words=10)
+    assert critic.evaluate("Prod is a scam ⚡").approved is True
+    with pytest.raises(AttributeError):
+        critic.blocklist.add("scam")
+
+    critic.blocklist = critic.blocklist | {"scam"}
+    assert critic.evaluate("Prod is a scam ⚡").approved is False
+
+    llm_critic = LLMCritic(product="Prod", llm=RecordingLLM("APPROVED"))
+    llm_critic.blocklist = {"scam"}
+    assert llm_critic.evaluate("Prod is a scam ⚡").approved is False
+
+
+def test_critic_with_empty_blocklist_blocks_nothing(blocklist_backend):
+    critic = Critic(product="Prod", max_words=10, blocklist=set())
+    assert critic.evaluate("Prod will kill it ⚡").approved is True
+
+
+def test_critic_detects_blocked_term_overlapping_product(blocklist_backend):
+    critic = Critic(product="Prod", max_words=10, blocklist={"rod"})
+    evaluation: Evaluation = critic.evaluate("Prod rocks ⚡")
+    assert evaluation.approved is False
+    assert "blocked terms" in evaluation.feedback
+    assert "mention the product" not in evaluation.feedback
+
+
+def test_critic_evaluate_batch_matches_single_evaluate():
+    critic = Critic(product="Prod", max_words=10)
+    captions = ["Prod rocks ⚡", "Prod rocks", "missing name ⚡"]
+    batch = critic.evaluate_batch(captions)
+    assert [e.approved for e in batch] == [critic.evaluate(c).approved for c in captions]
+    assert [e.approved for e in batch] == [True, False, False]
+
+
+class RecordingLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return self.reply
+
+
+def test_llm_critic_skips_model_when_hard_rules_fail():
+    llm = RecordingLLM("APPROVED")
+    critic = LLMCritic(product="Prod", llm=llm)
+    evaluation: Evaluation = critic.evaluate("Prod rocks")
+    assert evaluation.approved is False
+    assert "emoji" in evaluation.feedback.lower()
+    assert evaluation.metadata["brand_safety_check"] == "failed"
+    assert llm.calls == 0
+
+
+def test_llm_critic_consults_model_when_hard_rules_pass():
+    llm = RecordingLLM("REJECTED: tone is too flat")
+    critic = LLMCritic(product="Prod", llm=llm)
+    evaluation: Evaluation = critic.evaluate("Prod rocks ⚡")
+    assert evaluation.approved is False
+    assert evaluation.feedback == "tone is too flat"
+    assert llm.calls == 1
+
+
+def test_contains_emoji_range_boundaries():
+    assert contains_emoji("go \u2600") is True
+    assert contains_emoji("go \U0001FAFF") is True
+    assert contains_emoji("go \u27C0") is False
+    assert contains_emoji("plain text") is False
+
+
 def test_payload_shape_and_metadata():
     payload = build_adcp_payload(
         product="Prod",
@@ -33,3 +134,60 @@ def test_payload_shape_and_metadata():
     assert payload["payload"]["creative_assets"][0]["type"] == "text_ad"
     assert payload["payload"]["creative_assets"][0]["content"] == "Prod rocks ⚡"
     assert payload["metadata"]["brand_safety_check"] == "passed"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json_emits_indented_document(monkeypatch, capsys, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(adcp_workflow, "orjson", None)
+    doc = {"adcp_version": "1.0", "attempts": [{"sequence": 1, "content": "Prod rocks ⚡"}]}
+
+    adcp_workflow._write_json(doc)
+
+    out = capsys.readouterr().out
+    assert out.endswith("}\n")
+    assert json.loads(out) == doc
+
+
+def test_write_json_matches_between_encoders(monkeypatch):
+    doc = {"adcp_version": "1.0", "attempts": [{"sequence": 1, "content": "Prod rocks 🚀"}]}
+    outputs = []
+    for encoder in (adcp_workflow.orjson, None):
+        monkeypatch.setattr(adcp_workflow, "orjson", encoder)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            adcp_workflow._write_json(doc)
+        outputs.append(out.getvalue())
+
+    assert json.loads(outputs[0]) == json.loads(outputs[1]) == doc
+
+
+def test_write_json_supports_text_only_stdout():
+    doc = {"adcp_version": "1.0", "content": "Prod rocks ⚡"}
+    out = io.StringIO()
+
+    with redirect_stdout(out):
+        adcp_workflow._write_json(doc)
+
+    assert json.loads(out.getvalue()) == doc
+
+
+@pytest.mark.parametrize(
+    "encoding, emoji", [("utf-8", "⚡"), ("cp1252", "\\u26a1"), ("ascii", "\\u26a1")]
+)
+def test_write_json_respects_stdout_encoding(encoding, emoji):
+    doc = {"adcp_version": "1.0", "content": "Prod rocks ⚡"}
+    raw = io.BytesIO()
+    stream = io.TextIOWrapper(raw, encoding=encoding)
+
+    with redirect_stdout(stream):
+        print("header")
+        adcp_workflow._write_json(doc)
+    stream.flush()
+
+    out = raw.getvalue().decode(encoding)
+    assert out.startswith("header\n")
+    if encoding == "utf-8" and adcp_workflow.orjson is None:
+        emoji = "\\u26a1"
+    assert emoji in out
+    assert json.loads(out[len("header\n"):]) == doc
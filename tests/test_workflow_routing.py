@@ -1,7 +1,7 @@
 import pytest
 
 from agents import Evaluation
-from workflow_graph import build_graph, _critic_node
+from workflow_graph import build_graph, run_workflow, _cached_graph
 
 # deterministic creator and critics to be able to assert routing behaviour without LLMs
 
@@ -66,19 +66,35 @@ def test_routing_retries_until_approved():
 
 
 def test_attempt_budget_exhaustion_marks_exhausted():
-    critic = AlwaysRejectCritic()
-    node = _critic_node(critic, max_attempts=0)
-    state = {
-        "product": "Prod",
-        "audience": "QA",
-        "caption": "bad caption",
-        "feedback": None,
-        "approved": False,
-        "attempts": [],
-        "metadata": {},
-        "exhausted": False,
-    }
-    result = node(state)
-    assert result.get("exhausted") is True
-    assert result["approved"] is False
-    assert "Attempt budget exhausted" in result["feedback"]
+    creator = SequenceCreator(["bad one", "bad two", "bad three", "bad four"])
+    app = build_graph(creator, AlwaysRejectCritic(), max_attempts=3)
+
+    final_state = app.invoke(
+        {
+            "product": "Prod",
+            "audience": "QA",
+            "caption": "",
+            "feedback": None,
+            "approved": False,
+            "attempts": [],
+            "metadata": {},
+            "exhausted": False,
+        }
+    )
+
+    assert final_state["exhausted"] is True
+    assert final_state["approved"] is False
+    assert len(final_state["attempts"]) == 3
+    assert "Attempt budget exhausted" in final_state["feedback"]
+
+
+def test_run_workflow_reuses_compiled_graph_per_budget():
+    _cached_graph.cache_clear()
+
+    first = run_workflow("Alpha", "QA", max_attempts=4, creator_mode="template", critic_mode="heuristic")
+    second = run_workflow("Beta", "QA", max_attempts=4, creator_mode="template", critic_mode="heuristic")
+
+    info = _cached_graph.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+    assert "Alpha" in first["caption"]
+    assert "Beta" in second["caption"]
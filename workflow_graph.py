@@ -4,15 +4,14 @@ LangGraph-based orchestration for the Creator/Critic loop.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, TypedDict, Union
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
 
 from langgraph.graph import END, StateGraph
-from pydantic import BaseModel, Field
 
 from agents import Attempt, Creator, Critic, LLMCreator, LLMCritic
 
-from langchain_ollama import ChatOllama
-
 class GraphState(TypedDict):
     product: str
     audience: str
@@ -23,70 +22,55 @@ class GraphState(TypedDict):
     metadata: Dict[str, str]
     exhausted: bool  
 
-# used for pydantic validation on initial and final state 
-class GraphStateModel(BaseModel):
-    product: str
-    audience: str
-    caption: str = ""
-    feedback: Optional[str] = None
-    approved: bool = False
-    attempts: List[Attempt] = Field(default_factory=list)
-    metadata: Dict[str, str] = Field(default_factory=dict)
-    exhausted: bool = False
 
-    model_config = {"arbitrary_types_allowed": True}
+# critic evaluates, appends Attempt, and returns the feedback/approved/exhausted delta;
+# nodes return only the keys they change and LangGraph merges them
+def _critique(critic: Any, max_attempts: int, caption: str, attempts: List[Attempt]) -> Dict[str, Any]:
+    evaluation = critic.evaluate(caption)
+    # Record this attempt (caption + evaluation) in the history for tracking and exhaustion checks.
+    # Appended in place: the history list is owned by the run and threaded through every node.
+    attempts.append(Attempt(caption=caption, evaluation=evaluation))
+    exhausted = (len(attempts) >= max_attempts) and (not evaluation.approved)
+
+    # If exhausted, keep last evaluation + mark exhausted, but DO NOT raise.
+    if exhausted:
+        return {
+            "feedback": (
+                f"Attempt budget exhausted after {max_attempts} tries. "
+                f"Last feedback: {evaluation.feedback}"
+            ),
+            "approved": False,
+            "attempts": attempts,
+            "metadata": {**evaluation.metadata, "status": "rejected", "exhausted": "true"},
+            "exhausted": True,
+        }
+
+    return {
+        "feedback": evaluation.feedback,
+        "approved": evaluation.approved,
+        "attempts": attempts,
+        "metadata": evaluation.metadata,
+        "exhausted": False,
+    }
 
 
-# creator proposes caption
-def _creator_node(creator: Any):
-    def node(state: GraphState) -> GraphState:
+# one attempt: creator proposes, critic evaluates. The critic always follows the creator,
+# so both run in a single node and the graph only dispatches once per attempt.
+def _step_node(creator: Any, critic: Any, max_attempts: int):
+    def node(state: GraphState) -> Dict[str, Any]:
         # If we already exhausted attempts, don't generate anything new.
         if state.get("exhausted"):
-            return state
+            return {}
 
         caption = creator.propose(state.get("feedback"))
-        return {**state, "caption": caption}
+        update = _critique(critic, max_attempts, caption, state["attempts"])
+        update["caption"] = caption
+        return update
 
     return node
 
-# critic evaluates, appends Attempt, sets feedback/approved/exhausted
-def _critic_node(critic: Any, max_attempts: int):
-    def node(state: GraphState) -> GraphState:
-        # If we already exhausted attempts, just pass through.
-        if state.get("exhausted"):
-            return state
-
-        evaluation = critic.evaluate(state["caption"])
-        # Record this attempt (caption + evaluation) in the history for tracking and exhaustion checks
-        attempts = state["attempts"] + [Attempt(caption=state["caption"], evaluation=evaluation)]
-        exhausted = (len(attempts) >= max_attempts) and (not evaluation.approved)
-
-        # If exhausted, keep last evaluation + mark exhausted, but DO NOT raise.
-        if exhausted:
-            return {
-                **state,
-                "feedback": (
-                    f"Attempt budget exhausted after {max_attempts} tries. "
-                    f"Last feedback: {evaluation.feedback}"
-                ),
-                "approved": False,
-                "attempts": attempts,
-                "metadata": {**evaluation.metadata, "status": "rejected", "exhausted": "true"},
-                "exhausted": True,
-            }
-
-        return {
-            **state,
-            "feedback": evaluation.feedback,
-            "approved": evaluation.approved,
-            "attempts": attempts,
-            "metadata": evaluation.metadata,
-            "exhausted": False,
-        }
 
-    return node
-
-# sends to END if approved or exhausted, else back to creator 
+# sends to END if approved or exhausted, else back for another attempt
 def _route(state: GraphState) -> str:
     if state.get("exhausted"):
         return "done"
@@ -95,15 +79,33 @@ def _route(state: GraphState) -> str:
 
 def build_graph(creator: Any, critic: Any, max_attempts: int):
     graph = StateGraph(GraphState)
-    graph.add_node("creator", _creator_node(creator))
-    graph.add_node("critic", _critic_node(critic, max_attempts))
+    graph.add_node("step", _step_node(creator, critic, max_attempts))
 
-    graph.add_edge("__start__", "creator")
-    graph.add_edge("creator", "critic")
-    graph.add_conditional_edges("critic", _route, {"done": END, "retry": "creator"})
+    graph.add_edge("__start__", "step")
+    graph.add_conditional_edges("step", _route, {"done": END, "retry": "step"})
     return graph.compile()
 
 
+# (creator, critic) for the run_workflow call in progress; read by the cached graph
+_active_agents: ContextVar[Tuple[Any, Any]] = ContextVar("active_agents")
+
+
+class _ActiveCreator:
+    def propose(self, feedback: Optional[str] = None) -> str:
+        return _active_agents.get()[0].propose(feedback)
+
+
+class _ActiveCritic:
+    def evaluate(self, caption: str):
+        return _active_agents.get()[1].evaluate(caption)
+
+
+@lru_cache(maxsize=8)
+def _cached_graph(max_attempts: int):
+    """Compile the graph once per attempt budget; agents are bound per run."""
+    return build_graph(_ActiveCreator(), _ActiveCritic(), max_attempts=max_attempts)
+
+
 def run_workflow(
     product: str,
     audience: str,
@@ -117,25 +119,18 @@ def run_workflow(
     api_key: Optional[str] = None,
     openai_base_url: Optional[str] = None,
 ):
-    # IMPORTANT: build separate clients so critic can be deterministic
-    creator_llm = _build_llm(
-        provider=provider,
-        model=model,
-        temperature=temperature,
-        base_url=base_url,
-        api_key=api_key,
-        openai_base_url=openai_base_url,
-    )
-    critic_llm = _build_llm(
-        provider=provider,
-        model=model,
-        temperature=0.0,
-        base_url=base_url,
-        api_key=api_key,
-        openai_base_url=openai_base_url,
-    )
-
+    # IMPORTANT: build separate clients so critic can be deterministic.
+    # Clients are only built for LLM-backed agents, so template/heuristic runs
+    # never import a LangChain provider package.
     if creator_mode == "llm":
+        creator_llm = _build_llm(
+            provider=provider,
+            model=model,
+            temperature=temperature,
+            base_url=base_url,
+            api_key=api_key,
+            openai_base_url=openai_base_url,
+        )
         creator = LLMCreator(
             product=product,
             audience=audience,
@@ -148,6 +143,14 @@ def run_workflow(
         creator = Creator(product=product, audience=audience)
 
     if critic_mode == "llm":
+        critic_llm = _build_llm(
+            provider=provider,
+            model=model,
+            temperature=0.0,
+            base_url=base_url,
+            api_key=api_key,
+            openai_base_url=openai_base_url,
+        )
         critic = LLMCritic(
             product=product,
             max_words=15,
@@ -159,7 +162,7 @@ def run_workflow(
     else:
         critic = Critic(product=product)
 
-    app = build_graph(creator, critic, max_attempts=max_attempts)
+    app = _cached_graph(max_attempts)
 
     initial_state: GraphState = {
         "product": product,
@@ -172,13 +175,11 @@ def run_workflow(
         "exhausted": False,
     }
 
-    # Validate initial state shape
-    GraphStateModel.model_validate(initial_state)
-
-    final_state = app.invoke(initial_state)
-
-    # Validate final state shape
-    GraphStateModel.model_validate(final_state)
+    token = _active_agents.set((creator, critic))
+    try:
+        final_state = app.invoke(initial_state)
+    finally:
+        _active_agents.reset(token)
     return final_state
 
 
@@ -207,4 +208,6 @@ def _build_llm(
         )
 
     # Default to Ollama local
+    from langchain_ollama import ChatOllama
+
     return ChatOllama(model=model, temperature=temperature, base_url=base_url)